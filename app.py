@@ -1,21 +1,25 @@
 from __future__ import annotations
 
 import csv
+import gzip
+import hmac
 import os
 import random
+import shutil
 import threading
 import time
+from dataclasses import asdict
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 
 from parcels import fetch_parcel_objects_in_polygon
 from utils import LeadRow, clean_street_address
 from jurisdictions import add_jurisdiction, get_by_id, list_active, seed_default
-from connectors import get_connector
+from connectors import close_thread_browser, get_connector
 
 from reportlab.lib.pagesizes import letter, landscape
 from reportlab.lib.units import inch
@@ -36,9 +40,13 @@ app = FastAPI(title="RoofSpy (Florida-Ready)")
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
 
+_SECRET_KEY_B = SECRET_KEY.encode("utf-8")
+
+
 def require_key(request: Request):
+    # Route dependency; constant-time compare against the cached key bytes
     k = request.query_params.get("k") or request.headers.get("x-app-key") or ""
-    if k != SECRET_KEY:
+    if not hmac.compare_digest(k.encode("utf-8"), _SECRET_KEY_B):
         raise HTTPException(status_code=401, detail="Unauthorized")
 
 
@@ -116,6 +124,48 @@ def write_csv(path: Path, rows: List[LeadRow]):
                 ]
             )
 
+    # Pre-compressed copy served to clients that accept gzip (CSV shrinks ~10x)
+    with path.open("rb") as src, gzip.open(_gz_path(path), "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst)
+
+
+def _gz_path(path: Path) -> Path:
+    return path.with_name(path.name + ".gz")
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    # gzip wins only with a non-zero q-value, listed by name or via "*";
+    # "gzip;q=0" is an explicit refusal even when "*" is allowed
+    star = None
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding in ("gzip", "x-gzip"):
+            return q > 0
+        if coding == "*":
+            star = q > 0
+    return bool(star)
+
+
+def csv_response(request: Request, path: Path) -> FileResponse:
+    gz = _gz_path(path)
+    if _accepts_gzip(request.headers.get("accept-encoding", "")) and gz.exists():
+        return FileResponse(
+            str(gz),
+            media_type="text/csv",
+            filename=path.name,
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return FileResponse(str(path), filename=path.name, headers={"Vary": "Accept-Encoding"})
+
 
 def rows_to_pdf_bytes(rows: List[LeadRow], title: str) -> bytes:
     from io import BytesIO
@@ -166,20 +216,31 @@ def rows_to_pdf_bytes(rows: List[LeadRow], title: str) -> bytes:
         s = (s or "")
         return s if len(s) <= maxlen else (s[: maxlen - 1] + "…")
 
-    def draw_row(vals, bold=False):
+    draw = c.drawString
+    font = ""
+
+    def set_font(name: str):
+        nonlocal font
+        font = name
+        c.setFont(name, 8.7)
+
+    def draw_row(vals):
         nonlocal y
         if y < 0.6 * inch:
             c.showPage()
+            # showPage resets the canvas state, so restore the current font
+            c.setFont(font, 8.7)
             y = top
-        c.setFont("Helvetica-Bold" if bold else "Helvetica", 8.7)
-        for i, v in enumerate(vals):
-            c.drawString(col_x[i], y, v or "")
+        for x, v in zip(col_x, vals):
+            draw(x, y, v or "")
         y -= line_h
 
-    draw_row(headers, bold=True)
+    set_font("Helvetica-Bold")
+    draw_row(headers)
     c.line(left, y + 3, width - left, y + 3)
     y -= 6
 
+    set_font("Helvetica")
     for r in rows:
         draw_row(
             [
@@ -192,8 +253,7 @@ def rows_to_pdf_bytes(rows: List[LeadRow], title: str) -> bytes:
                 clip(r.permit_no, 12),
                 clip(r.type_line, 16),
                 clip(r.status, 18),
-            ],
-            bold=False,
+            ]
         )
 
     c.save()
@@ -203,6 +263,19 @@ def rows_to_pdf_bytes(rows: List[LeadRow], title: str) -> bytes:
 # -----------------------------
 # Scan runner
 # -----------------------------
+# LeadRow field -> connector result key, copied as-is for detected roofs
+_RESULT_FIELDS = (
+    ("query_used", "query_used"),
+    ("permit_no", "permit_no"),
+    ("type_line", "type_line"),
+    ("roof_date_used", "roof_date"),
+    ("issued", "issued"),
+    ("finalized", "finalized"),
+    ("applied", "applied"),
+    ("is_20plus", "is_20plus"),
+)
+
+
 def run_scan(parcels: List[Dict[str, str]], jurisdiction_id: int, delay_seconds: float, fast_mode: bool):
     global scan_stop_flag, _last_all_csv, _last_good_csv
 
@@ -290,23 +363,17 @@ def run_scan(parcels: List[Dict[str, str]], jurisdiction_id: int, delay_seconds:
                         except Exception:
                             yrs_str = str(yrs_val)
 
+                    get = res.get
                     row = LeadRow(
                         address=addr,
                         jurisdiction=jname,
                         owner=owner,
                         mailing_address=mailing,
                         phone=phone,
-                        query_used=str(res.get("query_used", "")),
-                        permit_no=str(res.get("permit_no", "")),
-                        type_line=str(res.get("type_line", "")),
-                        roof_date_used=str(res.get("roof_date", "")),
-                        issued=str(res.get("issued", "")),
-                        finalized=str(res.get("finalized", "")),
-                        applied=str(res.get("applied", "")),
                         roof_years=yrs_str,
-                        is_20plus=str(res.get("is_20plus", "")),
                         status="OK",
                         seconds=f"{elapsed:.1f}",
+                        **{field: str(get(key, "")) for field, key in _RESULT_FIELDS},
                     )
                     consecutive_errors = 0
 
@@ -346,17 +413,20 @@ def run_scan(parcels: List[Dict[str, str]], jurisdiction_id: int, delay_seconds:
             time.sleep(base_delay + extra + jitter)
 
     finally:
+        # The scan thread owns its Chromium; don't leave it running after we exit
+        close_thread_browser()
+
         ts = time.strftime("%Y%m%d_%H%M%S")
         all_path = DATA_DIR / f"leads_all_{ts}.csv"
         good_path = DATA_DIR / f"leads_good_20plus_{ts}.csv"
 
         with scan_lock:
             rows_copy = list(scan_rows)
-            good_copy = [r for r in rows_copy if r.is_20plus == "True"]
             scan_status["running"] = False
             scan_status["finished_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
             scan_status["message"] = "Done."
 
+        good_copy = [r for r in rows_copy if r.is_20plus == "True"]
         write_csv(all_path, rows_copy)
         write_csv(good_path, good_copy)
         _last_all_csv = all_path
@@ -366,22 +436,19 @@ def run_scan(parcels: List[Dict[str, str]], jurisdiction_id: int, delay_seconds:
 # -----------------------------
 # Routes
 # -----------------------------
-@app.get("/", response_class=HTMLResponse)
-def root(request: Request):
-    require_key(request)
+@app.get("/", response_class=HTMLResponse, dependencies=[Depends(require_key)])
+def root():
     return HTMLResponse((STATIC_DIR / "index.html").read_text(encoding="utf-8"))
 
 
-@app.get("/api/jurisdictions")
-def api_jurisdictions(request: Request):
-    require_key(request)
+@app.get("/api/jurisdictions", dependencies=[Depends(require_key)])
+def api_jurisdictions():
     items = list_active("FL")
-    return JSONResponse({"ok": True, "jurisdictions": [j.__dict__ for j in items]})
+    return JSONResponse({"ok": True, "jurisdictions": [asdict(j) for j in items]})
 
 
-@app.post("/api/jurisdictions/add")
+@app.post("/api/jurisdictions/add", dependencies=[Depends(require_key)])
 async def api_jurisdictions_add(request: Request):
-    require_key(request)
     body = await request.json()
 
     state = (body.get("state") or "FL").strip().upper()
@@ -396,16 +463,16 @@ async def api_jurisdictions_add(request: Request):
     return JSONResponse({"ok": True, "id": new_id})
 
 
-@app.get("/api/status")
-def api_status(request: Request):
-    require_key(request)
+@app.get("/api/status", dependencies=[Depends(require_key)])
+def api_status():
+    # Snapshot under the lock, serialize outside it
     with scan_lock:
-        return JSONResponse(dict(scan_status))
+        snap = scan_status.copy()
+    return JSONResponse(snap)
 
 
-@app.post("/api/parcels")
+@app.post("/api/parcels", dependencies=[Depends(require_key)])
 async def api_parcels(request: Request):
-    require_key(request)
     body = await request.json()
     latlngs = body.get("latlngs")
     limit = int(body.get("limit", 80))
@@ -419,10 +486,9 @@ async def api_parcels(request: Request):
         return JSONResponse({"ok": False, "error": str(e)})
 
 
-@app.post("/api/start")
+@app.post("/api/start", dependencies=[Depends(require_key)])
 async def api_start(request: Request):
     global scan_thread
-    require_key(request)
     body = await request.json()
 
     jurisdiction_id = int(body.get("jurisdiction_id") or 0)
@@ -447,19 +513,17 @@ async def api_start(request: Request):
     return JSONResponse({"ok": True})
 
 
-@app.post("/api/stop")
-def api_stop(request: Request):
+@app.post("/api/stop", dependencies=[Depends(require_key)])
+def api_stop():
     global scan_stop_flag
-    require_key(request)
     with scan_lock:
         scan_stop_flag = True
         scan_status["message"] = "Stopping…"
     return JSONResponse({"ok": True})
 
 
-@app.get("/download/all.pdf")
-def download_all_pdf(request: Request):
-    require_key(request)
+@app.get("/download/all.pdf", dependencies=[Depends(require_key)])
+def download_all_pdf():
     with scan_lock:
         rows_copy = list(scan_rows)
     if not rows_copy:
@@ -472,11 +536,12 @@ def download_all_pdf(request: Request):
     )
 
 
-@app.get("/download/good.pdf")
-def download_good_pdf(request: Request):
-    require_key(request)
+@app.get("/download/good.pdf", dependencies=[Depends(require_key)])
+def download_good_pdf():
+    # Rows are never mutated once appended, so filter the snapshot outside the lock
     with scan_lock:
-        rows_copy = [r for r in scan_rows if r.is_20plus == "True"]
+        rows_copy = list(scan_rows)
+    rows_copy = [r for r in rows_copy if r.is_20plus == "True"]
     if not rows_copy:
         raise HTTPException(404, "No 20+ year leads in memory yet. Run a scan first.")
     pdf = rows_to_pdf_bytes(rows_copy, title="RoofSpy Results (GOOD 20+)")
@@ -487,37 +552,33 @@ def download_good_pdf(request: Request):
     )
 
 
-@app.get("/download/all")
+@app.get("/download/all", dependencies=[Depends(require_key)])
 def download_all(request: Request):
-    require_key(request)
     if not _last_all_csv or not _last_all_csv.exists():
         raise HTTPException(404, "No CSV available yet.")
-    return FileResponse(str(_last_all_csv), filename=_last_all_csv.name)
+    return csv_response(request, _last_all_csv)
 
 
-@app.get("/download/good")
+@app.get("/download/good", dependencies=[Depends(require_key)])
 def download_good(request: Request):
-    require_key(request)
     if not _last_good_csv or not _last_good_csv.exists():
         raise HTTPException(404, "No CSV available yet.")
-    return FileResponse(str(_last_good_csv), filename=_last_good_csv.name)
+    return csv_response(request, _last_good_csv)
 
 
 # ============================================================
 # DEBUG ROUTES (EnerGov DOM debugging)
 # ============================================================
-@app.get("/debug/energov.png")
-def debug_energov_png(request: Request):
-    require_key(request)
+@app.get("/debug/energov.png", dependencies=[Depends(require_key)])
+def debug_energov_png():
     p = DATA_DIR / "energov_debug.png"
     if not p.exists():
         raise HTTPException(404, "No debug screenshot yet. Run a scan that triggers debug output first.")
     return FileResponse(str(p), filename="energov_debug.png")
 
 
-@app.get("/debug/energov.html")
-def debug_energov_html(request: Request):
-    require_key(request)
+@app.get("/debug/energov.html", dependencies=[Depends(require_key)])
+def debug_energov_html():
     p = DATA_DIR / "energov_debug.html"
     if not p.exists():
         raise HTTPException(404, "No debug html yet. Run a scan that triggers debug output first.")
@@ -9,7 +9,7 @@ import requests
 ARCGIS_LAYER_URL = "https://capeims.capecoral.gov/arcgis/rest/services/OpenData/OpenData/MapServer/1"
 
 
-@dataclass
+@dataclass(slots=True)
 class RawPermit:
     source_record_id: str
     address: str | None
@@ -76,7 +76,6 @@ class CapeCoralPermitsArcGISClient:
                 "Zip",
                 "Contractor",
                 "Company_Name",
-                "lastchangedon",
             ]
         )
 
@@ -90,6 +89,9 @@ class CapeCoralPermitsArcGISClient:
                 "resultOffset": offset,
                 "resultRecordCount": page_size,
                 "returnGeometry": "false",
+                # tables carry no geometry/M/Z; keep the Esri JSON envelope minimal
+                "returnZ": "false",
+                "returnM": "false",
             }
 
             r = self.s.get(f"{ARCGIS_LAYER_URL}/query", params=params, timeout=60)
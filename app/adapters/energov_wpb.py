@@ -6,7 +6,7 @@ import requests
 
 from ..settings import settings
 
-@dataclass
+@dataclass(slots=True)
 class RawPermit:
     source_record_id: str
     address: str | None
@@ -1,15 +1,16 @@
 from .services.ingest_capecoral import ingest_capecoral
-from fastapi import FastAPI, Depends, Query
+from fastapi import FastAPI, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 
 from .db import Base, engine, get_db
-from .models import Permit
+from .models import Permit, migrate_permits_table
 from .schemas import PermitOut
-from .scheduler import start_scheduler
+from .scheduler import ingest_lock, start_scheduler
 from .services.ingest import ingest_wpb
 from .settings import settings
 
+migrate_permits_table(engine)
 Base.metadata.create_all(bind=engine)
 
 app = FastAPI(title=settings.app_name)
@@ -25,7 +26,12 @@ def health():
 @app.post("/ingest/wpb")
 def ingest_now(db: Session = Depends(get_db)):
     # manual trigger for testing
-    return ingest_wpb(db, days_back=settings.ingest_days_back)
+    if not ingest_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="Ingest already running")
+    try:
+        return ingest_wpb(db, days_back=settings.ingest_days_back)
+    finally:
+        ingest_lock.release()
 
 @app.get("/permits", response_model=list[PermitOut])
 def list_permits(
@@ -64,7 +70,6 @@ def get_permit(permit_id: int, db: Session = Depends(get_db)):
     p = db.query(Permit).filter(Permit.id == permit_id).one_or_none()
     if not p:
         # fastapi default simple error
-        from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Not found")
     return p
 @app.post("/ingest/capecoral")
@@ -1,8 +1,40 @@
-from sqlalchemy import String, DateTime, Integer, UniqueConstraint, Index
+from sqlalchemy import String, DateTime, Integer, UniqueConstraint, Index, Computed
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex, CreateTable
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime
 from .db import Base
 
+# Permit type/status classification, done by the database itself so the
+# ingest loop never computes it per record.
+PERMIT_TYPE_NORMALIZED_SQL = (
+    "CASE"
+    " WHEN permit_type_raw IS NULL OR permit_type_raw = '' THEN NULL"
+    " WHEN UPPER(permit_type_raw) LIKE '%REROOF%'"
+    " OR UPPER(permit_type_raw) LIKE '%RE-ROOF%'"
+    " OR UPPER(permit_type_raw) LIKE '%RE ROOF%'"
+    " OR UPPER(permit_type_raw) LIKE '%REPLAC%' THEN 'ROOF_REPLACEMENT'"
+    " WHEN UPPER(permit_type_raw) LIKE '%REPAIR%' THEN 'ROOF_REPAIR'"
+    " WHEN UPPER(permit_type_raw) LIKE '%ROOF%' THEN 'ROOFING_OTHER'"
+    " ELSE 'OTHER' END"
+)
+
+STATUS_NORMALIZED_SQL = (
+    "CASE"
+    " WHEN status_raw IS NULL OR status_raw = '' THEN NULL"
+    " WHEN UPPER(status_raw) LIKE '%FINAL%'"
+    " OR UPPER(status_raw) LIKE '%CLOSED%'"
+    " OR UPPER(status_raw) LIKE '%COMPLET%' THEN 'CLOSED'"
+    " WHEN UPPER(status_raw) LIKE '%ISSUED%'"
+    " OR UPPER(status_raw) LIKE '%APPROV%'"
+    " OR UPPER(status_raw) LIKE '%PERMIT%' THEN 'ISSUED'"
+    " WHEN UPPER(status_raw) LIKE '%OPEN%'"
+    " OR UPPER(status_raw) LIKE '%IN REVIEW%'"
+    " OR UPPER(status_raw) LIKE '%PENDING%'"
+    " OR UPPER(status_raw) LIKE '%SUBMIT%' THEN 'OPEN'"
+    " ELSE 'UNKNOWN' END"
+)
+
 class Permit(Base):
     __tablename__ = "permits"
 
@@ -18,10 +50,14 @@ class Permit(Base):
     address_clean: Mapped[str | None] = mapped_column(String, index=True, nullable=True)
 
     permit_type_raw: Mapped[str | None] = mapped_column(String, nullable=True)
-    permit_type_normalized: Mapped[str | None] = mapped_column(String, index=True, nullable=True)
+    permit_type_normalized: Mapped[str | None] = mapped_column(
+        String, Computed(PERMIT_TYPE_NORMALIZED_SQL, persisted=True), index=True, nullable=True
+    )
 
     status_raw: Mapped[str | None] = mapped_column(String, nullable=True)
-    status_normalized: Mapped[str | None] = mapped_column(String, index=True, nullable=True)
+    status_normalized: Mapped[str | None] = mapped_column(
+        String, Computed(STATUS_NORMALIZED_SQL, persisted=True), index=True, nullable=True
+    )
 
     filed_date: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     issued_date: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -36,3 +72,55 @@ class Permit(Base):
         UniqueConstraint("source_city", "source_portal", "source_record_id", name="uq_source_record"),
         Index("ix_perm_addr_city", "source_city", "address_clean"),
     )
+
+
+
+_COMPUTED_COLUMNS = ("permit_type_normalized", "status_normalized")
+
+def migrate_permits_table(engine: Engine) -> None:
+    """
+    One-time rebuild of a permits table created before the normalized columns
+    became generated ones. SQLite can't ALTER a column into a generated column,
+    so the old table is renamed, the new one created and the rows copied over
+    (the generated columns are filled in by the copy).
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    raw = engine.raw_connection()
+    try:
+        db = raw.driver_connection
+        cols = db.execute("PRAGMA table_xinfo(permits)").fetchall()
+        # table_xinfo "hidden": 2 = virtual, 3 = stored generated column
+        if not cols or all(c[6] in (2, 3) for c in cols if c[1] in _COMPUTED_COLUMNS):
+            return  # no table yet (create_all builds it) or already migrated
+
+        old = {c[1] for c in cols}
+        copy = ", ".join(
+            c.name for c in Permit.__table__.columns if c.name in old and c.name not in _COMPUTED_COLUMNS
+        )
+        ddl = [str(CreateTable(Permit.__table__).compile(dialect=engine.dialect))]
+        ddl += [str(CreateIndex(ix).compile(dialect=engine.dialect)) for ix in Permit.__table__.indexes]
+
+        # sqlite3 commits implicitly around DDL; an explicit BEGIN keeps the rebuild atomic
+        level = db.isolation_level
+        db.isolation_level = None
+        try:
+            db.execute("BEGIN")
+            db.execute("ALTER TABLE permits RENAME TO permits_old")
+            # Index names are global in SQLite; drop the old ones so they can be recreated
+            for (name,) in db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'permits_old' AND sql IS NOT NULL"
+            ).fetchall():
+                db.execute(f'DROP INDEX "{name}"')
+            for stmt in ddl:
+                db.execute(stmt)
+            db.execute(f"INSERT INTO permits ({copy}) SELECT {copy} FROM permits_old")
+            db.execute("DROP TABLE permits_old")
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        finally:
+            db.isolation_level = level
+    finally:
+        raw.close()
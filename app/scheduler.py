@@ -1,3 +1,5 @@
+import threading
+
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from sqlalchemy.orm import Session
@@ -8,12 +10,22 @@ from .services.ingest import ingest_wpb
 
 scheduler = BackgroundScheduler()
 
+# Only one ingest at a time: scheduled runs and the manual /ingest/wpb trigger
+# share this, so they never contend for the DB while the API stays free.
+ingest_lock = threading.Lock()
+
 def _run_ingest():
-    db: Session = SessionLocal()
+    if not ingest_lock.acquire(blocking=False):
+        # previous run still going; skip instead of piling up behind it
+        return
     try:
-        ingest_wpb(db, days_back=settings.ingest_days_back)
+        db: Session = SessionLocal()
+        try:
+            ingest_wpb(db, days_back=settings.ingest_days_back)
+        finally:
+            db.close()
     finally:
-        db.close()
+        ingest_lock.release()
 
 def start_scheduler():
     # Two runs/day (simple, reliable). You can move to every 4 hours later.
@@ -22,11 +34,15 @@ def start_scheduler():
         CronTrigger(hour=settings.ingest_cron_hour_1, minute=5),
         id="ingest_am",
         replace_existing=True,
+        max_instances=1,
+        coalesce=True,
     )
     scheduler.add_job(
         _run_ingest,
         CronTrigger(hour=settings.ingest_cron_hour_2, minute=5),
         id="ingest_pm",
         replace_existing=True,
+        max_instances=1,
+        coalesce=True,
     )
     scheduler.start()
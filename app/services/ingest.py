@@ -3,12 +3,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from ..models import Permit
-from ..normalize import (
-    clean_street_address,
-    normalize_permit_type,
-    normalize_status,
-    is_roofing_permit,
-)
+from ..normalize import clean_street_address, is_roofing_permit
 from ..adapters.energov_wpb import EnerGovWPBClient
 
 SOURCE_CITY = "WEST PALM BEACH, FL"
@@ -41,8 +36,6 @@ def ingest_wpb(db: Session, days_back: int = 14) -> dict:
     roofing_count = 0
 
     for r in raw:
-        permit_type_norm = normalize_permit_type(r.permit_type)
-        status_norm = normalize_status(r.status)
         addr_clean = clean_street_address(r.address)
 
         if is_roofing_permit(r.permit_type):
@@ -56,9 +49,7 @@ def ingest_wpb(db: Session, days_back: int = 14) -> dict:
             "address_raw": r.address,
             "address_clean": addr_clean,
             "permit_type_raw": r.permit_type,
-            "permit_type_normalized": permit_type_norm,
             "status_raw": r.status,
-            "status_normalized": status_norm,
             "filed_date": r.filed_date,
             "issued_date": r.issued_date,
             "final_date": r.final_date,
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from ..models import Permit
-from ..normalize import clean_street_address, normalize_permit_type, normalize_status, is_roofing_permit
+from ..normalize import clean_street_address, is_roofing_permit
 from ..adapters.arcgis_capecoral_permits import CapeCoralPermitsArcGISClient
 
 SOURCE_CITY = "CAPE CORAL, FL"
@@ -46,9 +46,7 @@ def ingest_capecoral(db: Session, days_back: int = 14) -> dict:
             "address_raw": r.address,
             "address_clean": clean_street_address(r.address),
             "permit_type_raw": r.permit_type,
-            "permit_type_normalized": normalize_permit_type(r.permit_type),
             "status_raw": r.status,
-            "status_normalized": normalize_status(r.status),
             "filed_date": r.filed_date,
             "issued_date": r.issued_date,
             "final_date": r.final_date,
@@ -1,5 +1,5 @@
 from connectors.base import Jurisdiction, PermitConnector
-from connectors.energov import EnerGovConnector
+from connectors.energov import EnerGovConnector, close_thread_browser
 
 def get_connector(j: Jurisdiction) -> PermitConnector:
     system = (j.system or "").lower().strip()
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 import datetime as _dt
+import json
 import os
 import re
+import sqlite3
 import threading
 import time
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse, urlunparse
 
+import requests
 from playwright.sync_api import sync_playwright, TimeoutError as PWTimeoutError
 
 
@@ -18,35 +22,136 @@ DATA_DIR = Path(os.environ.get("DATA_DIR", "/app/data"))
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 # ============================================================
-# Playwright singleton
+# Playwright browser + page pool (per thread)
 # ============================================================
-_pw_lock = threading.Lock()
-_pw = None
-_browser = None
-_context = None
-
-def _get_context():
-    global _pw, _browser, _context
-    with _pw_lock:
-        if _context:
-            return _context
-
-        _pw = sync_playwright().start()
-        _browser = _pw.chromium.launch(headless=True)
-
-        _context = _browser.new_context(
-            viewport={"width": 1400, "height": 900},
-            user_agent="RoofSpy/1.0",
-        )
+# Playwright's sync API is bound to the thread that started it, so each worker
+# thread owns its driver, browser and a small LIFO pool of pages. Each pooled
+# page owns its own context (isolated cookies/storage) and is parked back on its
+# portal's search screen between searches, so the Angular app boots once per
+# page rather than once per query. Pages are retired after MAX_USES searches.
+# Only close_thread_browser() tears a thread's browser down, and it must run on
+# that thread; there is no exit hook, since another thread can't close it.
+POOL_SIZE = max(1, min(8, int(os.environ.get("ENERGOV_POOL_SIZE", "4"))))
+MAX_USES = 50
+
+_tls = threading.local()
+
+# Cookies/localStorage from the first good search, reused by later contexts and
+# restarts. The HTTP cache is not kept: new_context() contexts are off-the-record
+# and cache in memory, so the portal's JS is fetched once per context.
+STATE_PATH = DATA_DIR / "energov_state.json"
+_state_saved = False
+_LAUNCH_ARGS = [
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-gpu",
+]
+_INIT_SCRIPT = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+
+
+# Enforced inside Chromium via CDP, so blocked requests never wake up Python.
+# Stylesheets stay allowed: the input/grid visibility checks depend on them.
+_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*newrelic.com*", "*nr-data.net*", "*hotjar.com*", "*segment.io*", "*segment.com*",
+    "*intercom.io*", "*mixpanel.com*", "*tylerhost.net/telemetry*",
+]
+
+
+def _new_page(browser):
+    ctx = browser.new_context(
+        viewport={"width": 1400, "height": 900},
+        user_agent="RoofSpy/1.0",
+        storage_state=str(STATE_PATH) if STATE_PATH.exists() else None,
+    )
+    ctx.add_init_script(_INIT_SCRIPT)
+    page = ctx.new_page()
+    cdp = ctx.new_cdp_session(page)
+    cdp.send("Network.enable")
+    cdp.send("Network.setBlockedURLs", {"urls": _BLOCKED_URLS})
+    return page
+
+
+def _save_storage_state(ctx) -> None:
+    global _state_saved
+    if _state_saved:
+        return
+    _state_saved = True
+    tmp = STATE_PATH.with_suffix(".tmp")
+    try:
+        ctx.storage_state(path=str(tmp))
+        os.replace(tmp, STATE_PATH)
+    except Exception:
+        pass
 
-        def route_handler(route, request):
-            if request.resource_type in ("image", "media", "font"):
-                route.abort()
-            else:
-                route.continue_()
 
-        _context.route("**/*", route_handler)
-        return _context
+def _thread_state() -> Dict[str, Any]:
+    st = getattr(_tls, "state", None)
+    if st is None:
+        pw = sync_playwright().start()
+        try:
+            browser = pw.chromium.launch(headless=True, args=_LAUNCH_ARGS)
+        except Exception:
+            pw.stop()
+            raise
+        st = {"pw": pw, "browser": browser, "pages": []}
+        _tls.state = st
+    return st
+
+
+def _acquire_page(portal_url: str, fresh: bool = False) -> Dict[str, Any]:
+    st = _thread_state()
+    pages = st["pages"]
+    if not fresh:
+        # Prefer a page already parked on this portal
+        for i in range(len(pages) - 1, -1, -1):
+            if pages[i]["parked"] == portal_url:
+                return pages.pop(i)
+        if pages:
+            return pages.pop()
+    return {"page": _new_page(st["browser"]), "parked": None, "uses": 0}
+
+
+def _release_page(slot: Dict[str, Any], portal_url: str) -> None:
+    pages = _thread_state()["pages"]
+    page = slot["page"]
+    slot["uses"] += 1
+    try:
+        if slot["uses"] >= MAX_USES or len(pages) >= POOL_SIZE:
+            raise RuntimeError("retire page")
+        # Same-document hash navigation back to the search screen; the SPA stays
+        # booted but the old grid stays rendered until the next search replaces it
+        page.goto(portal_url, wait_until="commit", timeout=45000)
+        slot["parked"] = portal_url
+    except Exception:
+        try:
+            page.context.close()
+        except Exception:
+            pass
+        return
+    pages.append(slot)
+
+
+def _close_state(st: Dict[str, Any]) -> None:
+    try:
+        st["browser"].close()
+    except Exception:
+        pass
+    try:
+        st["pw"].stop()
+    except Exception:
+        pass
+
+
+def close_thread_browser() -> None:
+    """Shut down the calling thread's browser (call before a worker thread exits)."""
+    st = getattr(_tls, "state", None)
+    if st is None:
+        return
+    _tls.state = None
+    _close_state(st)
 
 
 # ============================================================
@@ -54,6 +159,7 @@ def _get_context():
 # ============================================================
 _WPB_SEARCH_FRAGMENT = "/search?m=2&ps=10&pn=1&em=true"
 
+@lru_cache(maxsize=4096)
 def _ensure_wpb_search_url(url: str) -> str:
     url = (url or "").strip()
     if not url:
@@ -74,41 +180,361 @@ def _ensure_wpb_search_url(url: str) -> str:
 # ============================================================
 _UNIT_MARKERS = r"(?:APT|UNIT|STE|SUITE|#)"
 
+_SPACE_RE = re.compile(r"\s+")
+_CLEAN_TAB = str.maketrans({",": " "})
+# FL and unit tails in one pass: cutting at the earliest marker is the same as
+# trimming the FL tail and then the unit tail
+_TAIL_RE = re.compile(rf"\b(?:FL|{_UNIT_MARKERS})\b")
+
 def _clean_spaces(s: str) -> str:
-    s = (s or "").replace(",", " ")
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+    return _SPACE_RE.sub(" ", (s or "").translate(_CLEAN_TAB)).strip()
 
+@lru_cache(maxsize=4096)
 def normalize_address(raw: str) -> str:
     s = _clean_spaces(raw).upper()
-    s = re.sub(r"\bFL\b.*$", "", s).strip()
-    s = re.sub(rf"\b{_UNIT_MARKERS}\b.*$", "", s).strip()
-    return s
+    m = _TAIL_RE.search(s)
+    return s[:m.start()].strip() if m else s
 
 
 # ============================================================
 # Extract helpers
 # ============================================================
-_DATE_RE = re.compile(r"\b(0?[1-9]|1[0-2])/(0?[1-9]|[12]\d|3[01])/(19|20)\d{2}\b")
+_ROW_SELECTOR = "tr, [role='row'], .mat-row, .mat-mdc-row"
+_ROW_TEXT_SELECTOR = _ROW_SELECTOR + ", [class*='row']"
+
+# Containers that may hold the results grid, most specific first
+_RESULTS_CONTAINERS = (
+    "[role='grid']",
+    "[role='table']",
+    "table",
+    ".mat-table",
+    ".mat-mdc-table",
+    ".results",
+    ".search-results",
+    ".content",
+    "main",
+    "body",
+)
+
+# Tag the dated result rows already on screen; a parked page still shows the
+# last search's grid
+_MARK_STALE_JS = r"""
+sel => {
+  const date = /\b(0?[1-9]|1[0-2])\/(0?[1-9]|[12]\d|3[01])\/(19|20)\d{2}\b/;
+  for (const r of document.querySelectorAll(sel)) {
+    if (date.test(r.innerText || "")) r.setAttribute("data-roofspy-stale", "1");
+  }
+}
+"""
+_NO_STALE_JS = "() => !document.querySelector('[data-roofspy-stale]')"
+_STALE_ERROR = "EnerGov: previous results still shown"
+
+# How long a search waits for the SPA's search API response before scraping the grid
+_XHR_WAIT_MS = 3000
+
+# Any visible, enabled, non-hidden input: the SPA's search screen is up
+_INPUT_READY_SELECTOR = "input:not([type='hidden']):not([disabled]):visible"
+
+# Best search box candidate (most specific selector first), or null
+_FIND_INPUT_JS = r"""
+() => {
+  const sels = [
+    'input[type=search]',
+    'input[placeholder*=Search i]',
+    'input[placeholder*=Address i]',
+    'input[aria-label*=Search i]',
+    'input[aria-label*=Address i]',
+    'input',
+  ];
+  for (const s of sels) {
+    for (const e of document.querySelectorAll(s)) {
+      const r = e.getBoundingClientRect();
+      if (r.width > 0 && r.height > 0 && !e.disabled && e.type !== 'hidden') return e;
+    }
+  }
+  return null;
+}
+"""
+
+# Index of the first container whose text has a roof term and a MM/DD/YYYY
+# date, or -1. Every _ROOF_ALT alternative contains "ROOF".
+_FIND_RESULTS_JS = r"""
+(sels) => {
+  const date = /\b(0?[1-9]|1[0-2])\/(0?[1-9]|[12]\d|3[01])\/(19|20)\d{2}\b/;
+  for (let i = 0; i < sels.length; i++) {
+    const el = document.querySelector(sels[i]);
+    if (!el) continue;
+    const t = (el.innerText || "").toUpperCase();
+    if (t.includes("ROOF") && date.test(t)) return i;
+  }
+  return -1;
+}
+"""
+
+# Non-empty innerText of up to `limit` rows matching `sel` under the element
+_ROW_TEXTS_JS = """
+(el, [sel, limit]) => Array.from(el.querySelectorAll(sel))
+  .map(r => r.innerText || "")
+  .filter(t => t.trim())
+  .slice(0, limit)
+"""
+
+_DATE_RE = re.compile(r"\b(0?[1-9]|1[0-2])/(0?[1-9]|[12]\d|3[01])/((?:19|20)\d{2})\b")
+# WPB case numbers look like B-21-012345 / RR-2019-0042; the loose pattern is the fallback
+_PERMIT_TIGHT_RE = re.compile(r"\b(?:B|BLD|RR|ROOF|PERMIT)[- ]?\d{2,4}[- ]?\d{3,6}\b")
 _PERMIT_RE = re.compile(r"\b[A-Z]{0,4}\d{3,}(?:-\d+)?\b")
 
-_ROOF_TERMS = (
-    "REROOF", "RE-ROOF", "RE ROOF",
-    "ROOF REPLAC", "ROOF REPLACE",
-    "ROOFING",
-    "ROOF",
-)
+# One alternation instead of a substring scan per roof term
+_ROOF_ALT = re.compile(r"(?P<reroof>RE[-\s]?ROOF)|ROOFING|ROOF\s?REPLAC|ROOF")
+_REROOF_RE = re.compile(r"RE[-\s]?ROOF")
+
+def _type_line(m: "re.Match[str]", up: str) -> str:
+    # The roof match already says REROOF when it came first; otherwise only the tail can
+    if m.group("reroof") or _REROOF_RE.search(up, m.end()):
+        return "REROOF"
+    return "ROOF"
+
+def _date_key(m: "re.Match[str]") -> int:
+    # YYYYMMDD as an int: orders like the date, no date object per match
+    mm, dd, yy = m.groups()
+    return int(yy) * 10000 + int(mm) * 100 + int(dd)
 
-def _parse_date(mmddyyyy: str) -> Optional[_dt.date]:
+def _key_to_date(key: int) -> Optional[_dt.date]:
     try:
-        mm, dd, yy = mmddyyyy.split("/")
-        return _dt.date(int(yy), int(mm), int(dd))
-    except Exception:
+        return _dt.date(key // 10000, (key // 100) % 100, key % 100)
+    except ValueError:
         return None
 
 def _extract_permit_no(text: str) -> str:
-    m = _PERMIT_RE.search(text)
-    return m.group(0) if m else ""
+    m = _PERMIT_TIGHT_RE.search(text)
+    if m:
+        return m.group(0)
+    # Loose fallback, skipping the year/day digits inside MM/DD/YYYY dates
+    date_spans = [d.span() for d in _DATE_RE.finditer(text)]
+    for m in _PERMIT_RE.finditer(text):
+        if not any(a <= m.start() < b for a, b in date_spans):
+            return m.group(0)
+    return ""
+
+def _best_roof_row(texts: List[str]) -> Optional[Tuple[_dt.date, str, str]]:
+    """
+    (roof date, permit no, type line) of the newest roof row in the grid texts.
+
+    Running max over roof rows. Every row is scanned: the grid's sort order
+    has not been checked on live data, so no row can be skipped.
+    """
+    best_key = 0
+    best: Optional[Tuple[_dt.date, str, str]] = None
+
+    for txt in texts:
+        up = txt.upper()
+        roof_m = _ROOF_ALT.search(up)
+        if not roof_m:
+            continue
+
+        keys = [_date_key(m) for m in _DATE_RE.finditer(up)]
+        if not keys:
+            continue
+
+        # Newest valid date in the row; only keys that could lead pay for a
+        # date object, and impossible ones (2/31 etc.) fall through to the next
+        for key in sorted(keys, reverse=True):
+            if key <= best_key:
+                break
+            roof_date = _key_to_date(key)
+            if roof_date is None:
+                continue
+            best_key = key
+            best = (roof_date, _extract_permit_no(up), _type_line(roof_m, up))
+            break
+
+    return best
+
+def _fmt_date(d: Optional[_dt.date]) -> str:
+    return d.strftime("%m/%d/%Y") if d else ""
+
+def _roof_result(
+    query_used: str,
+    roof_date: _dt.date,
+    permit_no: str,
+    type_line: str,
+    issued: Optional[_dt.date] = None,
+    finalized: Optional[_dt.date] = None,
+    applied: Optional[_dt.date] = None,
+) -> Dict[str, Any]:
+    return {
+        "roof_detected": True,
+        "query_used": query_used,
+        "permit_no": permit_no or "",
+        "type_line": type_line,
+        "roof_date": _fmt_date(roof_date),
+        "issued": _fmt_date(issued),
+        "finalized": _fmt_date(finalized),
+        "applied": _fmt_date(applied),
+        **_age_fields(roof_date),
+        "error": "",
+    }
+
+def _age_fields(roof_date: _dt.date) -> Dict[str, str]:
+    yrs = (_dt.date.today() - roof_date).days / 365.25
+    return {"roof_years": f"{yrs:.1f}", "is_20plus": "True" if yrs >= 20 else "False"}
+
+
+# ============================================================
+# Search result cache (SQLite, survives restarts)
+# ============================================================
+# Detected roofs are cached per (portal, normalized address). Entries expire
+# after ENERGOV_CACHE_DAYS so newly issued permits are picked up.
+CACHE_TTL_SECONDS = float(os.environ.get("ENERGOV_CACHE_DAYS", "14")) * 86400
+CACHE_PATH = DATA_DIR / "energov_cache.sqlite3"
+
+_cache_lock = threading.Lock()
+_cache_db: Optional[sqlite3.Connection] = None
+
+def _cache_conn() -> sqlite3.Connection:
+    global _cache_db
+    if _cache_db is None:
+        _cache_db = sqlite3.connect(str(CACHE_PATH), check_same_thread=False)
+        # WAL + NORMAL: cache writes don't fsync per commit or block readers
+        _cache_db.execute("PRAGMA journal_mode=WAL")
+        _cache_db.execute("PRAGMA synchronous=NORMAL")
+        _cache_db.execute("PRAGMA temp_store=MEMORY")
+        _cache_db.execute(
+            "CREATE TABLE IF NOT EXISTS search_cache ("
+            " portal_url TEXT NOT NULL, query TEXT NOT NULL, json_result TEXT NOT NULL,"
+            " updated_at REAL NOT NULL, PRIMARY KEY (portal_url, query))"
+        )
+        _cache_db.commit()
+    return _cache_db
+
+def _cache_get(portal_url: str, query: str) -> Optional[Dict[str, Any]]:
+    try:
+        with _cache_lock:
+            row = _cache_conn().execute(
+                "SELECT json_result, updated_at FROM search_cache WHERE portal_url = ? AND query = ?",
+                (portal_url, query),
+            ).fetchone()
+        if not row or time.time() - row[1] > CACHE_TTL_SECONDS:
+            return None
+        res = json.loads(row[0])
+        # Age moves on while the permit does not
+        res.update(_age_fields(_dt.datetime.strptime(res["roof_date"], "%m/%d/%Y").date()))
+        return res
+    except Exception:
+        return None
+
+def _cache_put(portal_url: str, query: str, res: Dict[str, Any]) -> None:
+    try:
+        with _cache_lock:
+            conn = _cache_conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache (portal_url, query, json_result, updated_at) VALUES (?, ?, ?, ?)",
+                (portal_url, query, json.dumps(res), time.time()),
+            )
+            conn.commit()
+    except Exception:
+        pass
+
+
+# ============================================================
+# EnerGov Self Service JSON API (browserless fast path)
+# ============================================================
+# The Self Service SPA fills its grid from this endpoint; calling it directly
+# skips Chromium entirely. Any failure falls back to the Playwright flow.
+_API_SEARCH_PATH = "api/energov/search/search"
+# Consecutive timeouts/5xx before the API is given up for a connector
+_API_MAX_ERRORS = 3
+
+def _api_endpoint(portal_url: str) -> Tuple[str, str]:
+    """
+    Returns (search API URL, tenant name) for a Self Service portal URL, e.g.
+    .../apps/selfservice/WestPalmBeachFLProd#/search -> .../apps/selfservice/api/..., "WestPalmBeachFLProd"
+    """
+    p = urlparse(portal_url)
+    i = p.path.lower().find("/selfservice")
+    if i < 0:
+        return "", ""
+    base = p.path[: i + len("/selfservice")]
+    tenant = p.path[len(base):].strip("/")
+    return urlunparse((p.scheme, p.netloc, f"{base}/{_API_SEARCH_PATH}", "", "", "")), tenant
+
+def _api_date(v: Any) -> Optional[_dt.date]:
+    # API dates are ISO strings like "2004-03-18T00:00:00"
+    try:
+        return _dt.date.fromisoformat(str(v)[:10]) if v else None
+    except ValueError:
+        return None
+
+# Row fields that may carry the permit's site address
+_API_ADDRESS_KEYS = ("AddressDisplay", "MainAddress", "Address", "SiteAddress")
+# Row fields that may carry the permit type / description
+_API_TYPE_KEYS = ("CaseType", "CaseWorkclass", "Description")
+_DIRECTIONALS = frozenset({"N", "S", "E", "W", "NE", "NW", "SE", "SW"})
+
+def _address_matcher(query_used: str) -> Optional[Tuple[str, str]]:
+    """(house number, first street word) of a normalized query, or None."""
+    parts = query_used.split()
+    if len(parts) < 2 or not parts[0][0].isdigit():
+        return None
+    street = next((w for w in parts[1:] if w not in _DIRECTIONALS), "")
+    return (parts[0], street) if street else None
+
+def _api_row_matches(row: Dict[str, Any], number: str, street: str) -> bool:
+    for k in _API_ADDRESS_KEYS:
+        v = row.get(k)
+        if isinstance(v, str) and v.strip():
+            parts = normalize_address(v).split()
+            if parts and parts[0] == number and street in parts[1:]:
+                return True
+    return False
+
+def _parse_api_results(data: Dict[str, Any], query_used: str) -> Optional[Dict[str, Any]]:
+    """
+    Roof result from a search JSON payload, or None when it is inconclusive.
+
+    The request body was never checked against a live portal, so rows are only
+    trusted when their address matches the query's house number and street, and
+    "no roof" is only concluded when a matching row has a permit type to read.
+    An empty or unrecognised envelope, no matching row, or matching rows with
+    no type fields return None so the caller falls back to the browser.
+    """
+    rows = ((data or {}).get("Result") or {}).get("EntityResults")
+    if not isinstance(rows, list) or not rows:
+        return None
+    matcher = _address_matcher(query_used)
+    if matcher is None:
+        return None
+    number, street = matcher
+
+    typed = False
+    best = None
+    for row in rows:
+        if not isinstance(row, dict) or not _api_row_matches(row, number, street):
+            continue
+        type_text = " ".join(
+            str(row.get(k) or "") for k in _API_TYPE_KEYS
+        ).strip().upper()
+        if not type_text:
+            continue
+        typed = True
+        roof_m = _ROOF_ALT.search(type_text)
+        if not roof_m:
+            continue
+        issued = _api_date(row.get("IssueDate"))
+        finalized = _api_date(row.get("FinalDate"))
+        applied = _api_date(row.get("ApplyDate"))
+        roof_date = issued or finalized or applied
+        if roof_date is None:
+            continue
+        if best is None or roof_date > best[0]:
+            type_line = _type_line(roof_m, type_text)
+            best = (roof_date, str(row.get("CaseNumber") or ""), type_line, issued, finalized, applied)
+
+    if not typed:
+        return None
+    if best is None:
+        return {"roof_detected": False, "query_used": query_used, "error": "NO_ROOF_PERMIT_FOUND"}
+    return _roof_result(query_used, *best)
 
 
 # ============================================================
@@ -126,61 +552,180 @@ class EnerGovConnector:
         self.portal_url = _ensure_wpb_search_url(raw)
         if not self.portal_url.startswith("http"):
             raise ValueError("Invalid EnerGov portal URL")
+        self._api_url, self._tenant = _api_endpoint(self.portal_url)
+        self._api_auth_failed = False
+        self._api_cookie_retry = False
+        self._api_errors = 0
+        self._http = requests.Session()
+        self._http.headers.update({"User-Agent": "RoofSpy/1.0", "Accept": "application/json"})
+        if self._tenant:
+            self._http.headers.update({"tenantName": self._tenant, "Tyler-TenantUrl": self._tenant})
 
     def search_roof(self, address: str) -> Dict[str, Any]:
         query_used = normalize_address(address)
         if not query_used:
             return {"roof_detected": False, "error": "Empty address", "query_used": ""}
+        # Street searches need a house number; skip cache/API/browser for "LOT 12", "PO BOX 3" ...
+        if not query_used[0].isdigit():
+            return {"roof_detected": False, "error": "Address has no house number", "query_used": query_used}
+
+        hit = _cache_get(self.portal_url, query_used)
+        if hit is not None:
+            return hit
+
+        res = self._search(query_used)
+        if res.get("roof_detected"):
+            _cache_put(self.portal_url, query_used, res)
+        return res
 
-        ctx = _get_context()
-        page = ctx.new_page()
-        page.set_default_timeout(45000)
+    def _search(self, query_used: str) -> Dict[str, Any]:
+        res = self._search_api(query_used)
+        if res is not None:
+            return res
+
+        slot = _acquire_page(self.portal_url)
+        try:
+            res = self._search_page(slot["page"], query_used, parked=slot["parked"] == self.portal_url)
+            if res.get("error") == _STALE_ERROR:
+                # The pool's failure, not the portal's: retire the page and search
+                # once more on a fresh one, which has no old grid
+                slot["uses"] = MAX_USES
+                _release_page(slot, self.portal_url)
+                slot = None
+                slot = _acquire_page(self.portal_url, fresh=True)
+                res = self._search_page(slot["page"], query_used)
+            page = slot["page"]
+            if not res.get("error"):
+                _save_storage_state(page.context)
+            # Reuse the portal session cookies for later API calls
+            try:
+                for ck in page.context.cookies(self.portal_url):
+                    self._http.cookies.set(ck["name"], ck["value"], domain=ck.get("domain"), path=ck.get("path", "/"))
+                if self._api_auth_failed and not self._api_cookie_retry:
+                    # One more try with the session cookies; a second 401/403 disables the API
+                    self._api_cookie_retry = True
+                    self._api_auth_failed = False
+            except Exception:
+                pass
+            return res
+        finally:
+            if slot is not None:
+                _release_page(slot, self.portal_url)
+
+    def _search_api(self, query_used: str) -> Optional[Dict[str, Any]]:
+        """
+        Browserless search via the Self Service JSON API.
+        Returns None when the API is unavailable or its answer is inconclusive,
+        so the caller falls back to Playwright.
+        """
+        if not self._api_url or self._api_auth_failed:
+            return None
+        body = {
+            "Keyword": query_used,
+            "ExactMatch": True,
+            "SearchModule": 2,  # permits, same as m=2 in the portal URL
+            "FilterModule": 2,
+            "PageNumber": 1,
+            "PageSize": 100,
+        }
+        try:
+            r = self._http.post(self._api_url, json=body, timeout=10)
+            if r.status_code in (404, 405, 501):
+                # No such endpoint on this portal; stop trying for this connector
+                self._api_url = ""
+                return None
+            if r.status_code in (401, 403):
+                if self._api_cookie_retry:
+                    # Rejected even with the portal's cookies
+                    self._api_url = ""
+                else:
+                    # Needs a session; retried once the browser path has lent us cookies
+                    self._api_auth_failed = True
+                return None
+            if r.status_code >= 500:
+                self._api_failed()
+                return None
+            if r.status_code != 200:
+                return None
+            self._api_errors = 0
+            data = r.json()
+        except requests.RequestException:
+            # Timeouts and connection errors
+            self._api_failed()
+            return None
+        except Exception:
+            return None
+        if not isinstance(data, dict) or not data.get("Success", True) or not isinstance(data.get("Result"), dict):
+            return None
+        return _parse_api_results(data, query_used)
+
+    def _api_failed(self) -> None:
+        # A hanging or erroring endpoint would cost its timeout on every address
+        self._api_errors += 1
+        if self._api_errors >= _API_MAX_ERRORS:
+            self._api_url = ""
+
+    def _search_page(self, page, query_used: str, parked: bool = False) -> Dict[str, Any]:
+        # Fail fast on individual waits; the initial SPA load keeps a longer budget
+        page.set_default_timeout(10000)
 
         try:
-            # 1) Load
-            page.goto(self.portal_url, wait_until="domcontentloaded")
-            time.sleep(0.8)
+            # 1) Load (a parked page is already on the search screen). Only wait for
+            #    the navigation to commit; the input wait below is the real readiness signal
+            if not parked:
+                page.goto(self.portal_url, wait_until="commit", timeout=45000)
 
             # 2) Wait for any visible enabled input
-            page.wait_for_function(
-                """
-                () => {
-                  const inputs = Array.from(document.querySelectorAll('input'));
-                  return inputs.some(i => {
-                    const r = i.getBoundingClientRect();
-                    const visible = r.width > 0 && r.height > 0;
-                    const notHidden = i.type !== 'hidden';
-                    const notDisabled = !i.disabled;
-                    return visible && notHidden && notDisabled;
-                  });
-                }
-                """,
-                timeout=35000,
-            )
-            time.sleep(0.6)
+            page.wait_for_selector(_INPUT_READY_SELECTOR, timeout=35000)
 
-            # 3) Pick first visible enabled input
-            search_box = None
-            loc = page.locator("input")
-            for i in range(min(loc.count(), 15)):
-                el = loc.nth(i)
-                try:
-                    if el.is_visible() and el.is_enabled():
-                        search_box = el
-                        break
-                except Exception:
-                    continue
+            # 3) Pick the search box browser-side in one round-trip
+            search_box = page.evaluate_handle(_FIND_INPUT_JS).as_element()
 
             if search_box is None:
                 return {"roof_detected": False, "error": "EnerGov page: no input fields found", "query_used": query_used}
 
-            # 4) Search
-            search_box.click()
+            # 4) Search (fill focuses and clears the box itself)
+            if parked:
+                page.evaluate(_MARK_STALE_JS, _ROW_SELECTOR)
             search_box.fill(query_used)
-            page.keyboard.press("Enter")
+            # 5) Wait for the SPA's own call to the search API; its JSON body is the
+            #    result set, so parse that directly and only fall back to the
+            #    rendered grid without a recognisable EntityResults envelope. The
+            #    path is unverified, so the wait is short: a miss costs ~3s before
+            #    the row wait below, not a full timeout per search
+            data = None
+            try:
+                with page.expect_response(
+                    lambda r: _API_SEARCH_PATH in r.url.lower()
+                    and r.status == 200
+                    and r.request.resource_type in ("xhr", "fetch"),
+                    timeout=_XHR_WAIT_MS,
+                ) as resp_info:
+                    search_box.press("Enter")
+                data = resp_info.value.json()
+            except PWTimeoutError:
+                pass
+            except Exception:
+                data = None
+            result = data.get("Result") if isinstance(data, dict) else None
+            if isinstance(result, dict) and "EntityResults" in result and data.get("Success") is not False:
+                parsed = _parse_api_results(data, query_used)
+                if parsed is not None:
+                    return parsed
+
+            if parked:
+                # The old grid has to go before rows can be read, or the previous
+                # address's permits would be returned (and cached) for this one
+                try:
+                    page.wait_for_function(_NO_STALE_JS, timeout=10000)
+                except PWTimeoutError:
+                    return {"roof_detected": False, "query_used": query_used, "error": _STALE_ERROR}
 
-            # 5) Give results time to load
-            time.sleep(2.0)
+            try:
+                page.wait_for_selector(_ROW_SELECTOR, state="attached", timeout=10000)
+            except PWTimeoutError:
+                # Zero-result searches never render rows; discovery below handles it
+                pass
 
             # ------------------------------------------------------------
             # RESULTS CONTAINER DISCOVERY (more robust, less assumptions)
@@ -194,33 +739,14 @@ class EnerGovConnector:
             # This avoids the "results grid not found" issue on WPB.
             # ------------------------------------------------------------
 
-            candidate_selectors = [
-                "[role='grid']",
-                "[role='table']",
-                "table",
-                ".mat-table",
-                ".mat-mdc-table",
-                ".results",
-                ".search-results",
-                ".content",
-                "main",
-                "body",
-            ]
-
+            # All candidates are probed browser-side in one round-trip
             grid = None
-            for sel in candidate_selectors:
-                try:
-                    cand = page.locator(sel).first
-                    if cand.count() == 0:
-                        continue
-                    # Try a quick content sample
-                    sample = cand.inner_text(timeout=2500)
-                    up = (sample or "").upper()
-                    if any(t in up for t in _ROOF_TERMS) and _DATE_RE.search(up):
-                        grid = cand
-                        break
-                except Exception:
-                    continue
+            try:
+                idx = page.evaluate(_FIND_RESULTS_JS, list(_RESULTS_CONTAINERS))
+            except Exception:
+                idx = -1
+            if idx >= 0:
+                grid = page.locator(_RESULTS_CONTAINERS[idx]).first
 
             if grid is None:
                 # Debug dump for us to lock correct selectors
@@ -241,7 +767,8 @@ class EnerGovConnector:
                     "error": "EnerGov: results grid not found (debug saved: /app/data/energov_debug.png and /app/data/energov_debug.html)",
                 }
 
-            # 6) Scroll a bit to render virtual rows
+            # 6) Scroll to render virtual rows; stop as soon as a scroll adds none
+            rendered = page.evaluate("sel => document.querySelectorAll(sel).length", _ROW_SELECTOR)
             for _ in range(8):
                 try:
                     grid.evaluate("el => { el.scrollBy(0, el.scrollHeight); }")
@@ -250,75 +777,33 @@ class EnerGovConnector:
                         page.mouse.wheel(0, 1400)
                     except Exception:
                         pass
-                time.sleep(0.25)
-
-            # 7) Extract row-like items inside grid
-            row_loc = grid.locator(
-                "xpath=.//*[self::tr or @role='row' or contains(@class,'mat-row') or contains(@class,'mat-mdc-row') or contains(@class,'row')][.//text()]"
-            )
-            row_count = row_loc.count()
+                try:
+                    page.wait_for_function(
+                        "([sel, n]) => document.querySelectorAll(sel).length > n",
+                        arg=[_ROW_SELECTOR, rendered],
+                        timeout=750,
+                    )
+                except PWTimeoutError:
+                    break
+                rendered = page.evaluate("sel => document.querySelectorAll(sel).length", _ROW_SELECTOR)
+
+            # 7) Extract row-like items inside grid (all row texts in one round-trip)
+            texts = grid.evaluate(_ROW_TEXTS_JS, [_ROW_TEXT_SELECTOR, 160])
 
             # Fallback: div-like blocks
-            if row_count == 0:
-                row_loc = grid.locator("xpath=.//*[self::div or self::li][.//text()]")
-                row_count = row_loc.count()
+            if not texts:
+                texts = grid.evaluate(_ROW_TEXTS_JS, ["div, li", 160])
 
-            if row_count == 0:
+            if not texts:
                 return {"roof_detected": False, "query_used": query_used, "error": "EnerGov: results present but no rows detected"}
 
-            roofing: List[Tuple[_dt.date, str, str]] = []
-
-            max_rows = min(row_count, 160)
-            for i in range(max_rows):
-                try:
-                    txt = row_loc.nth(i).inner_text(timeout=2200)
-                except Exception:
-                    continue
-                if not txt:
-                    continue
-
-                up = txt.upper()
-                if not any(t in up for t in _ROOF_TERMS):
-                    continue
-
-                dvals = [m.group(0) for m in _DATE_RE.finditer(up)]
-                dates = [_parse_date(dv) for dv in dvals]
-                dates = [d for d in dates if d is not None]
-                if not dates:
-                    continue
-
-                best_date = max(dates)
-                permit_no = _extract_permit_no(up)
-                type_line = "REROOF" if ("REROOF" in up or "RE-ROOF" in up or "RE ROOF" in up) else "ROOF"
-                roofing.append((best_date, permit_no, type_line))
-
-            if not roofing:
+            best = _best_roof_row(texts)
+            if best is None:
                 return {"roof_detected": False, "query_used": query_used, "error": "NO_ROOF_PERMIT_FOUND"}
 
-            roofing.sort(key=lambda x: x[0], reverse=True)
-            roof_date, permit_no, type_line = roofing[0]
-            yrs = (_dt.date.today() - roof_date).days / 365.25
-
-            return {
-                "roof_detected": True,
-                "query_used": query_used,
-                "permit_no": permit_no or "",
-                "type_line": type_line,
-                "roof_date": roof_date.strftime("%m/%d/%Y"),
-                "issued": "",
-                "finalized": "",
-                "applied": "",
-                "roof_years": f"{yrs:.1f}",
-                "is_20plus": "True" if yrs >= 20 else "False",
-                "error": "",
-            }
+            return _roof_result(query_used, *best)
 
         except PWTimeoutError:
             return {"roof_detected": False, "error": "EnerGov timeout loading/searching", "query_used": query_used}
         except Exception as e:
             return {"roof_detected": False, "error": f"EnerGov error: {type(e).__name__}: {e}", "query_used": query_used}
-        finally:
-            try:
-                page.close()
-            except Exception:
-                pass
@@ -2,17 +2,25 @@ from __future__ import annotations
 
 import json
 import os
+import threading
+import uuid
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
 
 # Persisted storage
 DATA_DIR = Path(os.environ.get("DATA_DIR", "/app/data"))
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 DB_PATH = DATA_DIR / "jurisdictions.db.json"
+PRETTY_JSON = os.environ.get("ROOFSPY_PRETTY_JSON", "").strip().lower() in ("1", "true", "yes")
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Jurisdiction:
     id: int
     state: str
@@ -22,74 +30,30 @@ class Jurisdiction:
     active: int = 1
 
 
-def _load_db() -> dict:
-    if not DB_PATH.exists():
-        return {"next_id": 1, "items": []}
-    return json.loads(DB_PATH.read_text(encoding="utf-8"))
+# Parsed DB keyed by file mtime: reads only hit the disk after the file changes.
+# Callers get the live dict, so anything that mutates it holds _db_lock.
+# (by id -> item, by (state, system, portal_url) -> item,
+#  state -> active Jurisdictions sorted by (name, id))
+_Indexes = Tuple[Dict[int, dict], Dict[Tuple[str, str, str], dict], Dict[str, List[Jurisdiction]]]
 
+_db_lock = threading.RLock()
+_db_cache: Optional[Tuple[int, dict, _Indexes]] = None
 
-def _save_db(db: dict) -> None:
-    DB_PATH.write_text(
-        json.dumps(db, indent=2, sort_keys=True),
-        encoding="utf-8"
-    )
 
-
-def seed_default() -> None:
-    """
-    Safe to call multiple times.
-    Seeds known jurisdictions once.
-    """
-    db = _load_db()
+def _build_indexes(db: dict) -> _Indexes:
     items = db.get("items", [])
-
-    # ✅ Use FULL WPB URL (with params). This prevents EnerGov UI weirdness.
-    defaults = [
-        {
-            "state": "FL",
-            "name": "WEST PALM BEACH",
-            "system": "energov",
-            "portal_url": "https://westpalmbeachfl-energovpub.tylerhost.net/apps/selfservice/WestPalmBeachFLProd#/search?m=2&ps=10&pn=1&em=true",
-            "active": 1,
-        }
-    ]
-
-    for d in defaults:
-        exists = any(
-            it.get("state") == d["state"]
-            and it.get("system") == d["system"]
-            and it.get("portal_url") == d["portal_url"]
-            for it in items
-        )
-        if not exists:
-            new_id = int(db.get("next_id", 1))
-            db["next_id"] = new_id + 1
-            items.append(
-                {
-                    "id": new_id,
-                    "state": d["state"],
-                    "name": d["name"],
-                    "system": d["system"],
-                    "portal_url": d["portal_url"],
-                    "active": int(d.get("active", 1)),
-                }
-            )
-
-    db["items"] = items
-    _save_db(db)
-
-
-def list_active(state: str) -> List[Jurisdiction]:
-    db = _load_db()
-    s = (state or "").strip().upper()
-    out: List[Jurisdiction] = []
-
-    for it in db.get("items", []):
-        if (it.get("state") or "").strip().upper() != s:
-            continue
+    by_id: Dict[int, dict] = {}
+    by_triple: Dict[Tuple[str, str, str], dict] = {}
+    # Reversed so the first matching item wins, like the linear scans did
+    for it in reversed(items):
+        by_id[int(it.get("id", 0))] = it
+        by_triple[(it.get("state"), it.get("system"), it.get("portal_url"))] = it
+
+    by_state: Dict[str, List[Jurisdiction]] = {}
+    for it in items:
         if int(it.get("active", 0)) != 1:
             continue
-        out.append(
+        by_state.setdefault((it.get("state") or "").strip().upper(), []).append(
             Jurisdiction(
                 id=int(it["id"]),
                 state=it["state"],
@@ -99,26 +63,128 @@ def list_active(state: str) -> List[Jurisdiction]:
                 active=int(it.get("active", 1)),
             )
         )
+    for js in by_state.values():
+        js.sort(key=lambda j: (j.name, j.id))
+    return by_id, by_triple, by_state
+
+
+def _load_indexed() -> Tuple[dict, _Indexes]:
+    global _db_cache
+    try:
+        mtime = DB_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        db = {"next_id": 1, "items": []}
+        return db, _build_indexes(db)
+    cached = _db_cache
+    if cached is not None and cached[0] == mtime:
+        return cached[1], cached[2]
+    raw = DB_PATH.read_bytes()
+    db = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    idx = _build_indexes(db)
+    _db_cache = (mtime, db, idx)
+    return db, idx
 
-    out.sort(key=lambda j: (j.name, j.id))
-    return out
 
+def _load_db() -> dict:
+    return _load_indexed()[0]
 
-def get_by_id(jurisdiction_id: int) -> Optional[Jurisdiction]:
-    db = _load_db()
-    jid = int(jurisdiction_id)
 
-    for it in db.get("items", []):
-        if int(it.get("id", 0)) == jid:
-            return Jurisdiction(
-                id=int(it["id"]),
-                state=it["state"],
-                name=it["name"],
-                system=it["system"],
-                portal_url=it["portal_url"],
-                active=int(it.get("active", 1)),
+def _save_db(db: dict) -> None:
+    global _db_cache
+    # Compact by default; ROOFSPY_PRETTY_JSON=1 keeps the indented, sorted form for hand inspection
+    if orjson is not None:
+        opt = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS if PRETTY_JSON else 0
+        data = orjson.dumps(db, option=opt)
+    elif PRETTY_JSON:
+        data = json.dumps(db, indent=2, sort_keys=True).encode("utf-8")
+    else:
+        data = json.dumps(db, separators=(",", ":")).encode("utf-8")
+
+    # Write a temp file and swap it in, so readers never see a torn DB
+    tmp = DB_PATH.with_name(f"{DB_PATH.name}.tmp.{os.getpid()}.{uuid.uuid4().hex[:8]}")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, DB_PATH)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        # Callers changed the cached dict in place; drop it so the next read
+        # comes from the file rather than serving the unsaved state
+        _db_cache = None
+        raise
+    _db_cache = (DB_PATH.stat().st_mtime_ns, db, _build_indexes(db))
+
+
+def seed_default() -> None:
+    """
+    Safe to call multiple times.
+    Seeds known jurisdictions once.
+    """
+    with _db_lock:
+        db = _load_db()
+        items = db.get("items", [])
+
+        # ✅ Use FULL WPB URL (with params). This prevents EnerGov UI weirdness.
+        defaults = [
+            {
+                "state": "FL",
+                "name": "WEST PALM BEACH",
+                "system": "energov",
+                "portal_url": "https://westpalmbeachfl-energovpub.tylerhost.net/apps/selfservice/WestPalmBeachFLProd#/search?m=2&ps=10&pn=1&em=true",
+                "active": 1,
+            }
+        ]
+
+        changed = False
+        for d in defaults:
+            exists = any(
+                it.get("state") == d["state"]
+                and it.get("system") == d["system"]
+                and it.get("portal_url") == d["portal_url"]
+                for it in items
             )
-    return None
+            if not exists:
+                changed = True
+                new_id = int(db.get("next_id", 1))
+                db["next_id"] = new_id + 1
+                items.append(
+                    {
+                        "id": new_id,
+                        "state": d["state"],
+                        "name": d["name"],
+                        "system": d["system"],
+                        "portal_url": d["portal_url"],
+                        "active": int(d.get("active", 1)),
+                    }
+                )
+
+        # Already seeded (the usual startup case): nothing to write
+        if changed:
+            db["items"] = items
+            _save_db(db)
+
+
+def list_active(state: str) -> List[Jurisdiction]:
+    # Filtered, built and sorted once per DB version in _build_indexes
+    _, (_, _, by_state) = _load_indexed()
+    return list(by_state.get((state or "").strip().upper(), ()))
+
+
+def get_by_id(jurisdiction_id: int) -> Optional[Jurisdiction]:
+    _, (by_id, _, _) = _load_indexed()
+    it = by_id.get(int(jurisdiction_id))
+    if it is None:
+        return None
+    return Jurisdiction(
+        id=int(it["id"]),
+        state=it["state"],
+        name=it["name"],
+        system=it["system"],
+        portal_url=it["portal_url"],
+        active=int(it.get("active", 1)),
+    )
 
 
 def add_jurisdiction(
@@ -132,38 +198,41 @@ def add_jurisdiction(
     Adds a jurisdiction or returns existing ID if duplicate.
     Dedupes by (state, system, portal_url).
     """
-    db = _load_db()
-    s = (state or "").strip().upper()
-    n = (name or "").strip()
-    sys = (system or "").strip().lower()
-    url = (portal_url or "").strip()
-
-    if not s or not n or not sys or not url:
-        raise ValueError("Missing jurisdiction fields")
-
-    # If identical entry exists, update name/active and return id
-    for it in db.get("items", []):
-        if it.get("state") == s and it.get("system") == sys and it.get("portal_url") == url:
-            it["name"] = n
-            it["active"] = int(active)
-            _save_db(db)
+    with _db_lock:
+        db, (_, by_triple, _) = _load_indexed()
+        s = (state or "").strip().upper()
+        n = (name or "").strip()
+        sys = (system or "").strip().lower()
+        url = (portal_url or "").strip()
+
+        if not s or not n or not sys or not url:
+            raise ValueError("Missing jurisdiction fields")
+
+        # If identical entry exists, update name/active and return id
+        it = by_triple.get((s, sys, url))
+        if it is not None:
+            # Re-adding an unchanged entry is common (re-seeding); skip the rewrite
+            if it.get("name") != n or int(it.get("active", 1)) != int(active):
+                it["name"] = n
+                it["active"] = int(active)
+                _save_db(db)
             return int(it["id"])
 
-    new_id = int(db.get("next_id", 1))
-    db["next_id"] = new_id + 1
-
-    db.setdefault("items", []).append(
-        {
-            "id": new_id,
-            "state": s,
-            "name": n,
-            "system": sys,
-            "portal_url": url,
-            "active": int(active),
-        }
-    )
-    _save_db(db)
-    return new_id
+        new_id = int(db.get("next_id", 1))
+        db["next_id"] = new_id + 1
+
+        db.setdefault("items", []).append(
+            {
+                "id": new_id,
+                "state": s,
+                "name": n,
+                "system": sys,
+                "portal_url": url,
+                "active": int(active),
+            }
+        )
+        _save_db(db)
+        return new_id
 
 
 def delete_jurisdiction(jurisdiction_id: int) -> bool:
@@ -171,14 +240,15 @@ def delete_jurisdiction(jurisdiction_id: int) -> bool:
     Deletes a jurisdiction by numeric id.
     Returns True if deleted, False if not found.
     """
-    db = _load_db()
-    jid = int(jurisdiction_id)
-    items = db.get("items", [])
-
-    new_items = [it for it in items if int(it.get("id", 0)) != jid]
-    if len(new_items) == len(items):
-        return False
-
-    db["items"] = new_items
-    _save_db(db)
-    return True
+    with _db_lock:
+        db = _load_db()
+        jid = int(jurisdiction_id)
+        items = db.get("items", [])
+
+        new_items = [it for it in items if int(it.get("id", 0)) != jid]
+        if len(new_items) == len(items):
+            return False
+
+        db["items"] = new_items
+        _save_db(db)
+        return True
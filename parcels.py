@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import os
 import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 # ----------------------------
@@ -33,6 +37,36 @@ OVERPASS_ENDPOINTS = [
 
 USER_AGENT = "RoofSpy/1.0"
 
+# Concurrent tile requests; capped at 4 to stay polite to the public Overpass servers
+OVERPASS_WORKERS = max(1, min(4, int(os.environ.get("OVERPASS_WORKERS", "4"))))
+
+
+def _make_session() -> requests.Session:
+    # Keep-alive pool shared by the ArcGIS pages and the Overpass tile workers.
+    # Both endpoints are read-only queries, so POST is safe to retry; Retry-After is honoured.
+    # Only a fast 429/5xx answer is retried, once: connect/read failures (a 120s
+    # Overpass read timeout) go straight to fetch_tile's endpoint rotation.
+    retry = Retry(
+        total=None,
+        connect=False,
+        read=False,
+        other=0,
+        status=1,
+        backoff_factor=0.5,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+    s = requests.Session()
+    s.headers.update({"User-Agent": USER_AGENT})
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+
+_SESSION = _make_session()
+
 
 # ----------------------------
 # Shared helpers
@@ -64,20 +98,25 @@ def _centroid(latlngs: List[List[float]]) -> Tuple[float, float]:
     return float(lat), float(lon)
 
 
-def _point_in_poly(lat: float, lon: float, poly: List[Tuple[float, float]]) -> bool:
-    # Ray casting
-    n = len(poly)
-    inside = False
-    j = n - 1
-    for i in range(n):
+def _poly_edges(poly: List[Tuple[float, float]]) -> List[Tuple[float, float, float, float]]:
+    # (yi, yj, xi, dx/dy) per edge: built once per polygon, not once per point
+    edges = []
+    j = len(poly) - 1
+    for i in range(len(poly)):
         yi, xi = poly[i][0], poly[i][1]
         yj, xj = poly[j][0], poly[j][1]
-        intersect = ((yi > lat) != (yj > lat)) and (
-            lon < (xj - xi) * (lat - yi) / ((yj - yi) if (yj - yi) != 0 else 1e-12) + xi
-        )
-        if intersect:
-            inside = not inside
+        dy = yj - yi
+        edges.append((yi, yj, xi, (xj - xi) / (dy if dy != 0 else 1e-12)))
         j = i
+    return edges
+
+
+def _point_in_edges(lat: float, lon: float, edges: List[Tuple[float, float, float, float]]) -> bool:
+    # Ray casting over precomputed edges
+    inside = False
+    for yi, yj, xi, k in edges:
+        if ((yi > lat) != (yj > lat)) and lon < k * (lat - yi) + xi:
+            inside = not inside
     return inside
 
 
@@ -137,10 +176,9 @@ def _arcgis_query_polygon(latlngs: List[List[float]], result_offset: int, result
         "resultRecordCount": str(int(result_count)),
     }
 
-    r = requests.post(
+    r = _SESSION.post(
         f"{PBC_FEATURE_LAYER}/query",
         data=params,
-        headers={"User-Agent": USER_AGENT},
         timeout=60,
     )
     if r.status_code != 200:
@@ -302,8 +340,7 @@ def _overpass_query_bbox(south: float, west: float, north: float, east: float) -
 
 
 def _post_overpass(endpoint: str, query: str) -> Dict[str, Any]:
-    headers = {"User-Agent": USER_AGENT, "Accept": "application/json"}
-    r = requests.post(endpoint, data={"data": query}, headers=headers, timeout=120)
+    r = _SESSION.post(endpoint, data={"data": query}, headers={"Accept": "application/json"}, timeout=120)
     if r.status_code != 200:
         raise RuntimeError(f"Overpass HTTP {r.status_code}: {r.text[:200]}")
     return r.json()
@@ -313,6 +350,7 @@ def _fetch_osm_in_polygon(latlngs: List[List[float]], limit: int) -> List[Dict[s
     limit = max(1, min(int(limit), 5000))
 
     poly = _poly_close(latlngs)
+    edges = _poly_edges(poly)
     south, west, north, east = _bbox_from_poly(poly)
     tiles = _tile_bbox_adaptive(south, west, north, east)
 
@@ -329,7 +367,10 @@ def _fetch_osm_in_polygon(latlngs: List[List[float]], limit: int) -> List[Dict[s
         key = addr.lower()
         if key in seen:
             return
-        if lat and lon and not _point_in_poly(lat, lon, poly):
+        if lat and lon and not (
+            # bbox reject first; only points inside it pay for the edge walk
+            south <= lat <= north and west <= lon <= east and _point_in_edges(lat, lon, edges)
+        ):
             return
         seen.add(key)
         results.append(
@@ -342,39 +383,47 @@ def _fetch_osm_in_polygon(latlngs: List[List[float]], limit: int) -> List[Dict[s
             }
         )
 
-    for idx, (s, w, n, e) in enumerate(tiles):
-        if len(results) >= limit:
-            break
-
-        query = _overpass_query_bbox(s, w, n, e)
+    def fetch_tile(idx: int, tile: Tuple[float, float, float, float]):
+        query = _overpass_query_bbox(*tile)
         last_err: Exception | None = None
-
         for attempt in range(1, 4):
             endpoint = endpoints[(idx + attempt - 1) % len(endpoints)]
             try:
                 data = _post_overpass(endpoint, query)
-                elements = data.get("elements", []) or []
-                for el in elements:
-                    tags = el.get("tags") or {}
-                    addr = _build_address(tags)
-                    if not addr:
-                        continue
-                    lat, lon = _element_center(el)
-                    add_candidate(addr, lat, lon)
-                    if len(results) >= limit:
-                        break
-                last_err = None
-                break
+                return idx, data.get("elements", []) or [], None
             except Exception as e:
                 last_err = e
                 time.sleep(min(6.0, (2 ** (attempt - 1)) + random.uniform(0.2, 0.8)))
-
-        # If Overpass is failing early, fail loudly so you see it
-        if last_err and len(results) < 10 and idx < 6:
-            raise RuntimeError(f"Overpass tile query failed early: {last_err}")
-
-        if idx % 6 == 0:
-            time.sleep(0.10)
+        return idx, [], last_err
+
+    # Tiles are fetched concurrently (network-bound) but merged here in tile
+    # order on the calling thread, so the limit cut is deterministic and
+    # seen/results need no locking
+    ex = ThreadPoolExecutor(max_workers=OVERPASS_WORKERS)
+    try:
+        futures = [ex.submit(fetch_tile, idx, tile) for idx, tile in enumerate(tiles)]
+        for fut in futures:
+            idx, elements, last_err = fut.result()
+            for el in elements:
+                tags = el.get("tags") or {}
+                addr = _build_address(tags)
+                if not addr:
+                    continue
+                lat, lon = _element_center(el)
+                add_candidate(addr, lat, lon)
+                if len(results) >= limit:
+                    break
+
+            # If Overpass is failing early, fail loudly so you see it
+            if last_err and len(results) < 10 and idx < 6:
+                raise RuntimeError(f"Overpass tile query failed early: {last_err}")
+
+            if len(results) >= limit:
+                break
+    finally:
+        # Drop queued tiles, but let running fetches finish so the next request
+        # can't push Overpass concurrency past OVERPASS_WORKERS
+        ex.shutdown(wait=True, cancel_futures=True)
 
     results.sort(key=lambda x: x.get("address", ""))
     return results
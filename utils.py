@@ -1,6 +1,7 @@
 from __future__ import annotations
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 
@@ -19,8 +20,27 @@ ROOF_TYPE_KEYWORDS = [
     "ROOF",
 ]
 
+# One scan for any roof keyword instead of a substring test per keyword
+_ROOF_KEYWORDS_RE = re.compile("|".join(re.escape(k) for k in ROOF_TYPE_KEYWORDS))
+
 FUTURE_CUTOFF = datetime.now() + timedelta(days=1)
 
+_TYPE_LINE_RE = re.compile(r"(?i)^\s*Type\s*:?\s+")
+_PERMIT_HDR_RE = re.compile(r"(?i)Permit Number\s*:?")
+_PERMIT_NO_RE = re.compile(r"(?i)Permit Number\s*:?\s*([A-Za-z0-9-]+)")
+
+_BLOCK_DATE_LABELS = ("Issued Date", "Finalized Date", "Applied Date")
+# All three block dates in one pass; group 1 is the label, group 2 the date
+_BLOCK_DATES_RE = re.compile(
+    r"(?i)\b(" + "|".join(_BLOCK_DATE_LABELS) + r")\b\s*:?\s*(\d{1,2}/\d{1,2}/\d{2,4})"
+)
+
+@lru_cache(maxsize=32)
+def _field_re(label: str) -> "re.Pattern[str]":
+    # Labels are a handful of constants ("Issued Date", ...): compile each once
+    return re.compile(rf"(?i)\b{label}\b\s*:?\s*(\d{{1,2}}/\d{{1,2}}/\d{{2,4}})")
+
+@lru_cache(maxsize=4096)
 def clean_street_address(addr: str) -> str:
     addr = (addr or "").replace(",", " ")
     addr = " ".join(addr.split()).strip()
@@ -60,28 +80,26 @@ def roof_age_years(d: Optional[datetime]) -> Optional[float]:
     return (datetime.now() - d).days / 365.25
 
 def extract_field(block_text: str, label: str) -> Optional[str]:
-    m = re.search(rf"(?i)\b{label}\b\s*:?\s*(\d{{1,2}}/\d{{1,2}}/\d{{2,4}})", block_text)
+    m = _field_re(label).search(block_text)
     return m.group(1) if m else None
 
 def extract_type_line(block_lines: List[str]) -> str:
     for line in block_lines:
-        if re.match(r"(?i)^\s*Type\s*:?\s+", line):
+        if _TYPE_LINE_RE.match(line):
             return line.strip()
     return ""
 
 def block_is_roof(type_line: str, block_text: str) -> bool:
-    t = norm(type_line)
-    if any(k in t for k in ROOF_TYPE_KEYWORDS):
+    if _ROOF_KEYWORDS_RE.search(norm(type_line)):
         return True
-    bt = norm(block_text)
-    return any(k in bt for k in ROOF_TYPE_KEYWORDS)
+    return _ROOF_KEYWORDS_RE.search(norm(block_text)) is not None
 
 def parse_permit_blocks_from_text(page_text: str) -> List[Dict[str, Any]]:
     if not page_text:
         return []
     txt = page_text.replace("\r\n", "\n")
 
-    hits = [m.start() for m in re.finditer(r"(?i)Permit Number\s*:?", txt)]
+    hits = [m.start() for m in _PERMIT_HDR_RE.finditer(txt)]
     if not hits:
         return []
     hits.append(len(txt))
@@ -93,13 +111,18 @@ def parse_permit_blocks_from_text(page_text: str) -> List[Dict[str, Any]]:
     for blk in raw_blocks:
         lines = [ln.strip() for ln in blk.splitlines() if ln.strip()]
 
-        m_perm = re.search(r"(?i)Permit Number\s*:?\s*([A-Za-z0-9-]+)", blk)
+        m_perm = _PERMIT_NO_RE.search(blk)
         permit_no = m_perm.group(1) if m_perm else ""
 
         type_line = extract_type_line(lines)
-        issued = parse_date(extract_field(blk, "Issued Date"))
-        finalized = parse_date(extract_field(blk, "Finalized Date"))
-        applied = parse_date(extract_field(blk, "Applied Date"))
+        found: Dict[str, str] = {}
+        for m in _BLOCK_DATES_RE.finditer(blk):
+            found.setdefault(m.group(1).upper(), m.group(2))
+            if len(found) == len(_BLOCK_DATE_LABELS):
+                break
+        issued = parse_date(found.get("ISSUED DATE"))
+        finalized = parse_date(found.get("FINALIZED DATE"))
+        applied = parse_date(found.get("APPLIED DATE"))
 
         parsed.append({
             "permit_no": permit_no,
@@ -111,7 +134,7 @@ def parse_permit_blocks_from_text(page_text: str) -> List[Dict[str, Any]]:
         })
     return parsed
 
-@dataclass
+@dataclass(slots=True)
 class LeadRow:
     address: str
     jurisdiction: str = ""          # NEW: selected jurisdiction name